@@ -77,6 +77,20 @@ REQUEST_TIMEOUT = 30
 ARXIV_API_TIMEOUT = 20
 ARXIV_RETRY_COUNT = 3
 ARXIV_DELAY_SECONDS = 2
+# Papers per arXiv API id_list query
+ARXIV_BATCH_SIZE = 50
+# Concurrent arXiv lookups; request starts are still spaced by ARXIV_DELAY_SECONDS
+ARXIV_MAX_WORKERS = 16
+# arXiv metadata is cached here across runs (set to None to disable); cached
+# papers are re-fetched after ARXIV_CACHE_TTL_DAYS (None = never)
+ARXIV_CACHE_PATH = "cache/arxiv.sqlite3"
+ARXIV_CACHE_TTL_DAYS = None
+# Connections kept alive per host by the shared HTTP session
+HTTP_POOL_SIZE = 32
+
+# Logging: the full INFO log always goes to logs/sync.log; the console only
+# shows messages at or above this level
+CONSOLE_LOG_LEVEL = "WARNING"
 
 # Maximum number of entries to process (None = all entries)
 # Set to a small number (e.g., 5) for quick testing
@@ -85,6 +99,8 @@ MAX_ENTRIES = None
 
 # LaTeX rendering settings
 KATEX_TIMEOUT = 10
+# Rendered formulas are cached here across runs (set to None to disable)
+KATEX_CACHE_PATH = "cache/katex.sqlite3"
 
 # RSS feed metadata
 RSS_TITLE = "DMRG cond-mat"
@@ -8,20 +8,21 @@ from datetime import datetime
 from html import escape
 
 from .latex_renderer import LaTeXRenderer
-from ..utils.text_utils import is_entry_complete, latex_to_unicode
+from ..utils.text_utils import is_entry_complete, latex_to_unicode, parse_rfc2822
 from ..config import HTML_TITLE, HTML_DESCRIPTION
 
 
 class HTMLGenerator:
     """Generator for mobile-responsive HTML paper listings."""
     
-    def __init__(self, output_path, skip_numeric_prices=False, rss_path=None):
+    def __init__(self, output_path, skip_numeric_prices=False, rss_path=None, katex_cache_path=None):
         """
         Initialize HTML generator.
         
         Args:
             output_path (str): Path where HTML file will be saved
             rss_path (str): Path to corresponding RSS file (if None, auto-derived from output_path)
+            katex_cache_path (str): SQLite file caching KaTeX renders across runs (None = disabled)
         """
         self.output_path = output_path
         
@@ -36,10 +37,14 @@ class HTMLGenerator:
         self.rss_filename = self.rss_path.split('/')[-1]
         
         # Pass configuration into LaTeXRenderer
-        self.latex_renderer = LaTeXRenderer()
+        self.latex_renderer = LaTeXRenderer(cache_path=katex_cache_path)
         # Honor caller preference for skipping numeric/price-like $...$
         self.latex_renderer.skip_numeric_prices = skip_numeric_prices
     
+    def close(self):
+        """Release resources held by the LaTeX renderer (flushes its render cache)."""
+        self.latex_renderer.close()
+    
     def get_css_styles(self):
         """
         Get CSS styles for mobile-responsive design.
@@ -122,6 +127,13 @@ class HTMLGenerator:
             /* Inline math formulas */
         }
         
+        .katex-lite {
+            /* Trivial inline math rendered without KaTeX */
+            font-family: KaTeX_Main, "Times New Roman", serif;
+            font-size: 1.1em;
+            white-space: nowrap;
+        }
+        
         .katex {
             font-size: 1.1em;
         }
@@ -551,9 +563,11 @@ class HTMLGenerator:
         """
         logging.info(f"Generating HTML with {len(entries)} entries")
         
-        # Filter complete entries
-        complete_entries = [e for e in entries if is_entry_complete(e)]
-        incomplete_entries = [e for e in entries if not is_entry_complete(e)]
+        # Split complete and incomplete entries in one pass
+        complete_entries = []
+        incomplete_entries = []
+        for e in entries:
+            (complete_entries if is_entry_complete(e) else incomplete_entries).append(e)
         
         if incomplete_entries:
             logging.warning(f"HTML generation using {len(complete_entries)} complete entries, skipping {len(incomplete_entries)} incomplete entries")
@@ -580,8 +594,7 @@ class HTMLGenerator:
                 if 'T' in pubdate and pubdate.endswith('Z'):
                     return datetime.strptime(pubdate, "%Y-%m-%dT%H:%M:%SZ")
                 else:
-                    from email.utils import parsedate_to_datetime
-                    return parsedate_to_datetime(pubdate)
+                    return parse_rfc2822(pubdate)
             except:
                 return datetime.min
         
@@ -605,8 +618,7 @@ class HTMLGenerator:
                         if 'T' in pubdate and pubdate.endswith('Z'):
                             dt = datetime.strptime(pubdate, "%Y-%m-%dT%H:%M:%SZ")
                         else:
-                            from email.utils import parsedate_to_datetime
-                            dt = parsedate_to_datetime(pubdate)
+                            dt = parse_rfc2822(pubdate)
                         display_date = dt.strftime("%Y-%m-%d")
                     except:
                         display_date = str(pubdate)
@@ -3,27 +3,205 @@
 LaTeX rendering module using KaTeX CLI.
 Handles preprocessing and safe rendering of LaTeX formulas.
 """
+import os
 import re
+import time
+import hashlib
+import sqlite3
+import threading
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+
+# More KaTeX processes than this rarely helps and mostly adds Node startup cost
+MAX_KATEX_WORKERS = 16
+
+# Least recently used renders beyond this count are evicted from the disk cache
+DEFAULT_CACHE_MAX_ENTRIES = 50000
+
+# Inline formulas made only of these characters (e.g. $n$, $1/2$, $L=4$) bypass the
+# KaTeX CLI. The lightweight rendering only approximates KaTeX: it adds no spacing
+# around relations or binary operators and keeps spaces from the source.
+_TRIVIAL_FORMULA_RE = re.compile(r'[A-Za-z0-9.,+\-/=()<>| ]+')
+_TRIVIAL_FORMULA_MAX_LEN = 8
+_TRIVIAL_TOKEN_RE = re.compile(r'([A-Za-z]+)|[^A-Za-z]+')
+
+_PLACEHOLDER_RE = re.compile(r'__KATEX_PLACEHOLDER_\d+__')
+
+# Formula delimiters: $$...$$ (display) and single $...$ (inline)
+_DISPLAY_MATH_RE = re.compile(r'\$\$([^$]+?)\$\$', re.DOTALL)
+_INLINE_MATH_RE = re.compile(r'(?<!\$)\$([^$\n]+?)\$(?!\$)')
+
+# Price-like formulas (e.g. $99.99) skipped when skip_numeric_prices is set
+_NUMERIC_RE = re.compile(r'[\d.,\s]+')
+
+# Non-standard commands rewritten by preprocess_formula
+_UNICODE_DASH_RE = re.compile(r'\\unicode\{x201[34]\}')
+_UNICODE_CMD_RE = re.compile(r'\\unicode\{[^}]+\}')
+_CROSS_RE = re.compile(r'\\[Cc]ross\b')
+_VECTOR_RE = re.compile(r'\\vector\{([^}]+)\}')
+_MBOX_RE = re.compile(r'\\mbox\{([^}]*)\}')
 
 
 class LaTeXRenderer:
     """Handler for LaTeX formula rendering using KaTeX CLI."""
     
-    def __init__(self, timeout=10):
+    def __init__(self, timeout=10, n_workers=None, cache_path=None, cache_max_entries=DEFAULT_CACHE_MAX_ENTRIES):
         """
         Initialize LaTeX renderer.
         
         Args:
             timeout (int): Timeout for KaTeX rendering in seconds
+            n_workers (int, optional): Number of concurrent KaTeX processes
+                (None = one per CPU core, capped at MAX_KATEX_WORKERS)
+            cache_path (str, optional): SQLite file for caching rendered formulas
+                across runs (None = no disk cache)
+            cache_max_entries (int): Maximum number of cached renders kept on disk
         """
         self.timeout = timeout
+        self.n_workers = min(n_workers or os.cpu_count() or 1, MAX_KATEX_WORKERS)
+        self._executor = None
+        
+        self.cache_max_entries = cache_max_entries
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._cache_hits = set()
+        if cache_path:
+            self._open_cache(cache_path)
         # If True, skip rendering of pure-numeric/price-like $...$ expressions
         # (e.g. $99.99, $2) because these are usually not math to render.
         # Set to False to attempt to render all $...$ content.
         self.skip_numeric_prices = False
     
+    def _open_cache(self, cache_path):
+        """
+        Open (or create) the on-disk render cache.
+        
+        Args:
+            cache_path (str): Path to the SQLite cache file
+        """
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            # Accessed from render_many() worker threads, guarded by _cache_lock
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS renders ("
+                "key TEXT PRIMARY KEY, html TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._check_katex_version()
+            count = self._cache.execute("SELECT COUNT(*) FROM renders").fetchone()[0]
+            logging.info(f"KaTeX render cache opened: {cache_path} ({count} entries)")
+        except Exception as e:
+            logging.warning(f"KaTeX render cache disabled, failed to open {cache_path}: {e}")
+            self._cache = None
+    
+    def _katex_version(self):
+        """
+        Return the installed KaTeX CLI version.
+        
+        Returns:
+            str or None: Output of `katex --version`, or None if unavailable
+        """
+        try:
+            result = subprocess.run(
+                ["katex", "--version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+                timeout=self.timeout
+            )
+            return result.stdout.decode("utf-8").strip() or None
+        except Exception:
+            return None
+    
+    def _check_katex_version(self):
+        """
+        Clear the render cache if it was filled by a different KaTeX version.
+        
+        The workflow installs the latest KaTeX on every run, so cached HTML
+        would otherwise outlive an upgrade.
+        """
+        version = self._katex_version()
+        if version is None:
+            # Without a version the cache cannot be validated; leave it as is
+            logging.warning("Could not determine KaTeX version, render cache not validated")
+            return
+        
+        row = self._cache.execute("SELECT value FROM meta WHERE name = 'katex_version'").fetchone()
+        if row is not None and row[0] == version:
+            return
+        if row is not None:
+            logging.info(f"KaTeX version changed ({row[0]} -> {version}), clearing render cache")
+        self._cache.execute("DELETE FROM renders")
+        self._cache.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('katex_version', ?)", (version,)
+        )
+        self._cache.commit()
+    
+    def _cache_key(self, processed_formula, display_mode):
+        """Content hash identifying a formula and its rendering mode."""
+        data = f"{int(display_mode)}|{processed_formula.strip()}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _cache_get(self, key):
+        """Return the cached rendering for key, or None."""
+        with self._cache_lock:
+            row = self._cache.execute("SELECT html FROM renders WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._cache_hits.add(key)
+            return row[0]
+    
+    def _cache_put(self, key, rendered):
+        """Store a successful rendering under key."""
+        with self._cache_lock:
+            try:
+                self._cache.execute(
+                    "INSERT OR REPLACE INTO renders (key, html, last_used) VALUES (?, ?, ?)",
+                    (key, rendered, time.time())
+                )
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to store formula in KaTeX render cache: {e}")
+    
+    def close(self):
+        """
+        Shut down the render workers, then flush and close the on-disk render
+        cache, evicting least recently used entries.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+        if self._cache is None:
+            return
+        
+        with self._cache_lock:
+            try:
+                now = time.time()
+                self._cache.executemany(
+                    "UPDATE renders SET last_used = ? WHERE key = ?",
+                    ((now, key) for key in self._cache_hits)
+                )
+                self._cache.execute(
+                    "DELETE FROM renders WHERE key NOT IN "
+                    "(SELECT key FROM renders ORDER BY last_used DESC LIMIT ?)",
+                    (self.cache_max_entries,)
+                )
+                self._cache.commit()
+                logging.info(f"KaTeX render cache saved ({len(self._cache_hits)} hits this run)")
+            except Exception as e:
+                logging.warning(f"Failed to save KaTeX render cache: {e}")
+            finally:
+                self._cache.close()
+                self._cache = None
+                self._cache_hits.clear()
+    
     def preprocess_formula(self, formula):
         """
         Preprocess LaTeX formula to handle KaTeX unsupported commands.
@@ -42,21 +220,64 @@ class LaTeXRenderer:
         
         # Convert non-standard commands to standard LaTeX equivalents
         # \unicode{x2014} (em dash) and \unicode{x2013} (en dash) -> hyphen
-        processed = re.sub(r'\\unicode\{x201[34]\}', '-', processed)
+        processed = _UNICODE_DASH_RE.sub('-', processed)
         # Remove other unicode commands
-        processed = re.sub(r'\\unicode\{[^}]+\}', '', processed)
+        processed = _UNICODE_CMD_RE.sub('', processed)
         
         # \cross -> \times (vector cross product, case-insensitive)
-        processed = re.sub(r'\\[Cc]ross\b', r'\\times', processed)
+        processed = _CROSS_RE.sub(r'\\times', processed)
         
         # \vector{x} -> \vec{x} (vector notation)
-        processed = re.sub(r'\\vector\{([^}]+)\}', r'\\vec{\1}', processed)
+        processed = _VECTOR_RE.sub(r'\\vec{\1}', processed)
         
         # \mbox{...} -> \text{...} (text in math mode)
-        processed = re.sub(r'\\mbox\{([^}]*)\}', r'\\text{\1}', processed)
+        processed = _MBOX_RE.sub(r'\\text{\1}', processed)
         
         return processed
     
+    def _get_error_details(self, cmd, processed_formula):
+        """
+        Re-run a failed KaTeX command to collect its error output.
+        
+        Args:
+            cmd (list): KaTeX command that failed
+            processed_formula (str): Preprocessed formula passed to KaTeX
+            
+        Returns:
+            str: KaTeX error message, or empty string if unavailable
+        """
+        try:
+            result = subprocess.run(
+                cmd,
+                input=processed_formula.strip().encode("utf-8"),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout
+            )
+            return result.stderr.decode('utf-8')
+        except Exception:
+            return ""
+    
+    def render_trivial_formula(self, formula):
+        """
+        Render a trivial inline formula (no TeX commands, braces or scripts) directly.
+        
+        Args:
+            formula (str): Preprocessed LaTeX formula
+            
+        Returns:
+            str or None: Lightweight HTML span, or None if KaTeX is required
+        """
+        stripped = formula.strip()
+        if len(stripped) > _TRIVIAL_FORMULA_MAX_LEN or not _TRIVIAL_FORMULA_RE.fullmatch(stripped):
+            return None
+        # Italicise variables like KaTeX does; digits and operators stay upright
+        body = _TRIVIAL_TOKEN_RE.sub(
+            lambda m: f"<i>{m.group(1)}</i>" if m.group(1) else escape(m.group(0)).replace('-', '\u2212'),
+            stripped
+        )
+        return f'<span class="katex-lite">{body}</span>'
+    
     def render_formula(self, formula, display_mode=False):
         """
         Safely render a single LaTeX formula using KaTeX CLI.
@@ -77,21 +298,36 @@ class LaTeXRenderer:
             # Only skip if skip_numeric_prices is True
             if self.skip_numeric_prices:
                 formula_stripped = formula.strip()
-                if len(formula_stripped) <= 10 and re.match(r'^[\d.,\s]+$', formula_stripped):
+                if len(formula_stripped) <= 10 and _NUMERIC_RE.fullmatch(formula_stripped):
                     # This looks like a price, not a formula
                     return f"${formula}$" if not display_mode else f"$${formula}$$"
             
             # Preprocess formula (now just returns original)
             processed_formula = self.preprocess_formula(formula)
             
+            # Trivial inline math does not need a KaTeX round trip
+            if not display_mode:
+                lite = self.render_trivial_formula(processed_formula)
+                if lite is not None:
+                    return lite
+            
+            cache_key = None
+            if self._cache is not None:
+                cache_key = self._cache_key(processed_formula, display_mode)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+            
             cmd = ["katex"]
             if display_mode:
                 cmd.append("--display-mode")
             
+            # stderr is only needed when rendering fails, so it is not buffered here
             result = subprocess.run(
                 cmd,
                 input=processed_formula.strip().encode("utf-8"),
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 check=True,
                 timeout=self.timeout
             )
@@ -99,6 +335,8 @@ class LaTeXRenderer:
             rendered = result.stdout.decode("utf-8").strip()
             
             if rendered and ('<span' in rendered or '<div' in rendered):
+                if cache_key is not None:
+                    self._cache_put(cache_key, rendered)
                 return rendered
             else:
                 logging.warning(f"[KaTeX Warning] Unexpected output for formula: {formula}")
@@ -109,8 +347,9 @@ class LaTeXRenderer:
             return f"${formula}$" if not display_mode else f"$${formula}$$"
         except subprocess.CalledProcessError as e:
             logging.warning(f"[KaTeX Error] Failed to render formula: {formula}")
-            if e.stderr:
-                error_msg = e.stderr.decode('utf-8')
+            # Re-run once with stderr captured to report why KaTeX failed
+            error_msg = self._get_error_details(e.cmd, processed_formula)
+            if error_msg:
                 logging.warning(f"Error details: {error_msg}")
             # Try to provide a fallback with plain text representation
             fallback = self.preprocess_formula(formula)
@@ -126,6 +365,25 @@ class LaTeXRenderer:
             logging.warning(f"Error: {str(e)}")
             return f"${formula}$" if not display_mode else f"$${formula}$$"
     
+    def render_many(self, formulas):
+        """
+        Render several formulas, running KaTeX processes in parallel.
+        
+        Args:
+            formulas (list): List of (formula, display_mode) tuples
+            
+        Returns:
+            list: Rendered HTML or fallback strings, in input order
+        """
+        if len(formulas) < 2 or self.n_workers < 2:
+            return [self.render_formula(formula, display_mode) for formula, display_mode in formulas]
+        
+        # Each render_formula call blocks on its own KaTeX process, so threads
+        # are enough to keep n_workers Node processes busy at once
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_workers)
+        return list(self._executor.map(lambda args: self.render_formula(*args), formulas))
+    
     def render_in_html(self, html_content):
         """
         Render LaTeX formulas in HTML content using KaTeX.
@@ -139,50 +397,47 @@ class LaTeXRenderer:
         if not html_content:
             return html_content
         
-        processed_formulas = {}
-        placeholder_counter = 0
+        # Formulas are collected first and rendered together so that
+        # render_many() can spread the KaTeX calls across workers
+        pending = []
         
-        def create_placeholder():
-            nonlocal placeholder_counter
-            placeholder = f"__KATEX_PLACEHOLDER_{placeholder_counter}__"
-            placeholder_counter += 1
+        def create_placeholder(formula, display_mode):
+            placeholder = f"__KATEX_PLACEHOLDER_{len(pending)}__"
+            pending.append((placeholder, formula, display_mode))
             return placeholder
         
         def process_display_math(match):
-            formula = match.group(1)
-            placeholder = create_placeholder()
-            rendered = self.render_formula(formula, display_mode=True)
-            # Check if rendering was successful (contains KaTeX HTML) or is fallback
-            if '<span' in rendered or '<div' in rendered:
-                processed_formulas[placeholder] = f'<div class="katex-display" style="margin: 1.5em 0; text-align: center;">{rendered}</div>'
-            else:
-                # Fallback case, rendered is already in $$formula$$ format
-                processed_formulas[placeholder] = f'<div class="katex-display" style="margin: 1.5em 0; text-align: center;">{rendered}</div>'
-            return placeholder
+            return create_placeholder(match.group(1), True)
         
         def process_inline_math(match):
-            formula = match.group(1)
             if '$$' in match.group(0):
                 return match.group(0)
-            placeholder = create_placeholder()
-            rendered = self.render_formula(formula, display_mode=False)
-            # Check if rendering was successful (contains KaTeX HTML) or is fallback
-            if '<span' in rendered or '<div' in rendered:
+            return create_placeholder(match.group(1), False)
+        
+        # Process display math formulas $$...$$
+        html_content = _DISPLAY_MATH_RE.sub(process_display_math, html_content)
+        
+        # Process inline math formulas $...$
+        html_content = _INLINE_MATH_RE.sub(process_inline_math, html_content)
+        
+        rendered_formulas = self.render_many([(formula, display_mode) for _, formula, display_mode in pending])
+        
+        processed_formulas = {}
+        for (placeholder, _, display_mode), rendered in zip(pending, rendered_formulas):
+            if display_mode:
+                # Fallback output is already in $$formula$$ format, wrap it the same way
+                processed_formulas[placeholder] = f'<div class="katex-display" style="margin: 1.5em 0; text-align: center;">{rendered}</div>'
+            elif '<span' in rendered or '<div' in rendered:
                 # Successfully rendered, wrap in katex-inline
                 processed_formulas[placeholder] = f'<span class="katex-inline">{rendered}</span>'
             else:
                 # Fallback case, rendered is already in $formula$ format, don't double-wrap
                 processed_formulas[placeholder] = rendered
-            return placeholder
         
-        # Process display math formulas $$...$$
-        html_content = re.sub(r'\$\$([^$]+?)\$\$', process_display_math, html_content, flags=re.DOTALL)
-        
-        # Process inline math formulas $...$
-        html_content = re.sub(r'(?<!\$)\$([^$\n]+?)\$(?!\$)', process_inline_math, html_content)
-        
-        # Replace all placeholders
-        for placeholder, rendered in processed_formulas.items():
-            html_content = html_content.replace(placeholder, rendered)
+        # Replace all placeholders in a single pass
+        if processed_formulas:
+            html_content = _PLACEHOLDER_RE.sub(
+                lambda m: processed_formulas.get(m.group(0), m.group(0)), html_content
+            )
         
         return html_content
@@ -4,15 +4,17 @@ RSS feed generator module.
 """
 import os
 import logging
-import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from feedgen.feed import FeedGenerator
-from email.utils import parsedate_to_datetime
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree as ET
 
-from ..utils.text_utils import format_date_for_rss, latex_to_unicode, generate_entry_id
+from ..utils.text_utils import format_date_for_rss, latex_to_unicode, generate_entry_id, parse_rfc2822
 from ..config import RSS_TITLE, RSS_DESCRIPTION, RSS_LANGUAGE, TARGET_URL
 
+DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"
+DC_CREATOR_TAG = f"{{{DC_NAMESPACE}}}creator"
+
 
 class RSSGenerator:
     """Generator for RSS feed from entry data."""
@@ -49,23 +51,22 @@ class RSSGenerator:
             successful_loads = 0
             for item in items:
                 try:
-                    link_elem = item.find("link")
-                    if link_elem is not None and link_elem.text:
-                        link = link_elem.text.strip()
+                    # Read all child texts in one pass instead of a findtext per field
+                    fields = self._child_texts(item)
+                    link = fields.get("link", "").strip()
+                    if link:
                         entry_id = generate_entry_id(link)
                         
-                        title = item.findtext("title", "").strip()
-                        authors = item.findtext("{http://purl.org/dc/elements/1.1/}creator") or ""
-                        authors = authors.strip()
+                        title = fields.get("title", "").strip()
+                        authors = fields.get(DC_CREATOR_TAG, "").strip()
                         
                         # Extract abstract from description (remove HTML tags)
-                        description = item.findtext("description", "").strip()
+                        description = fields.get("description", "").strip()
                         abstract = ""
                         if description:
                             # Extract abstract from HTML description
                             try:
-                                desc_soup = BeautifulSoup(description, "html.parser")
-                                text = desc_soup.get_text()
+                                text = lxml.html.fragment_fromstring(description, create_parent="div").text_content()
                                 if "Abstract:" in text:
                                     abstract = text.split("Abstract:", 1)[1].strip()
                                     # Remove the "Published" part if it exists
@@ -76,7 +77,7 @@ class RSSGenerator:
                             except:
                                 abstract = description
                         
-                        pubdate = item.findtext("pubDate", "").strip() or None
+                        pubdate = fields.get("pubDate", "").strip() or None
                         
                         existing_entries[entry_id] = {
                             "id": entry_id,
@@ -88,7 +89,7 @@ class RSSGenerator:
                         }
                         successful_loads += 1
                 except Exception as e:
-                    logging.warning(f"Failed to parse RSS item: {e}")
+                    logging.warning("Failed to parse RSS item: %s", e)
                     continue
             
             logging.info(f"Successfully loaded {successful_loads} existing entries")
@@ -100,6 +101,147 @@ class RSSGenerator:
             
         return existing_entries
     
+    def _child_texts(self, item):
+        """
+        Map each child tag of an <item> to its text.
+        
+        Args:
+            item (Element): RSS item element
+            
+        Returns:
+            dict: Child text (empty string if none) indexed by tag
+        """
+        return {child.tag: child.text or "" for child in item}
+    
+    def _prepare_entry(self, index, entry):
+        """
+        Compute the RSS fields for a single entry.
+        
+        Args:
+            index (int): Position of the entry in the feed
+            entry (dict): Entry dictionary
+            
+        Returns:
+            dict or None: Title, pubdate, description and creator, or None on failure
+        """
+        try:
+            # Convert LaTeX accents to Unicode
+            title = latex_to_unicode(entry.get("title", "Untitled"))
+            authors = latex_to_unicode(entry.get("authors", "Unknown"))
+            abstract = latex_to_unicode(entry.get("abstract", "No abstract available"))
+            
+            # Build description
+            arxiv_id = entry["link"].rsplit("/", 1)[-1]
+            
+            # Handle publication date
+            pubdate = entry.get("pubdate")
+            if pubdate:
+                formatted_date = format_date_for_rss(pubdate)
+                if formatted_date:
+                    try:
+                        # Parse date for display
+                        if 'T' in pubdate and pubdate.endswith('Z'):
+                            dt = datetime.strptime(pubdate, "%Y-%m-%dT%H:%M:%SZ")
+                        else:
+                            dt = parse_rfc2822(pubdate)
+                        display_date = dt.strftime("%a, %d %b %Y %H:%M:%S")
+                    except:
+                        display_date = pubdate
+                else:
+                    # Fallback to current time
+                    current_time = datetime.now(timezone.utc)
+                    formatted_date = current_time.strftime("%a, %d %b %Y %H:%M:%S %z")
+                    display_date = "Unknown"
+            else:
+                # Use current time if no publication date
+                current_time = datetime.now(timezone.utc)
+                formatted_date = current_time.strftime("%a, %d %b %Y %H:%M:%S %z")
+                display_date = "Unknown"
+                logging.warning("No pubdate for entry: %s", entry['link'])
+            
+            # Log dates for first few entries to verify sorting
+            if index < 3:
+                logging.info("Entry %d date: %s", index + 1, display_date)
+            
+            # Create description
+            description = f"<b>Author(s):</b> {authors}<br><br><b>Abstract:</b> {abstract}<br><br><b>[<a href='{entry['link']}'>arXiv:{arxiv_id}</a>] Published {display_date} UTC</b>"
+            
+            return {
+                "title": title,
+                "pubdate": formatted_date,
+                "description": description,
+                "creator": authors or "Unknown"
+            }
+            
+        except Exception as e:
+            logging.error("Failed to add entry %s: %s", entry.get('link', 'unknown'), e)
+            return None
+    
+    def _load_existing_items(self):
+        """
+        Load the raw <item> elements of the existing RSS file.
+        
+        Returns:
+            dict: Dictionary of item elements indexed by entry link
+        """
+        if not os.path.exists(self.output_path):
+            return {}
+        
+        try:
+            root = ET.parse(self.output_path).getroot()
+        except Exception as e:
+            logging.warning(f"Could not reuse items from existing RSS: {e}")
+            return {}
+        
+        items = {}
+        for item in root.iter("item"):
+            link = (item.findtext("link") or "").strip()
+            if link:
+                items[link] = item
+        return items
+    
+    def _item_matches(self, item, fields):
+        """
+        Check whether an existing <item> already holds the prepared fields.
+        
+        Args:
+            item (Element): Item element from the existing RSS file
+            fields (dict): Fields returned by _prepare_entry
+            
+        Returns:
+            bool: True if the item can be reused unchanged
+        """
+        existing = self._child_texts(item)
+        return (existing.get("title") == fields["title"]
+                and existing.get("pubDate") == fields["pubdate"]
+                and existing.get("description") == fields["description"]
+                and existing.get(DC_CREATOR_TAG) == fields["creator"])
+    
+    def _merge_items(self, channel, generated_items, generated_indices, reused_items):
+        """
+        Replace the channel items with generated and reused items in feed order.
+        
+        Args:
+            channel (Element): Channel element of the generated feed
+            generated_items (list): Items produced by FeedGenerator (newest added first)
+            generated_indices (list): Entry index of each generated item, in add order
+            reused_items (dict): Reused item elements indexed by entry index
+        """
+        # FeedGenerator prepends entries, so its items come out in reverse add order
+        items_by_index = dict(reused_items)
+        items_by_index.update(zip(generated_indices, reversed(generated_items)))
+        ordered = [items_by_index[index] for index in sorted(items_by_index, reverse=True)]
+        
+        for item in generated_items:
+            channel.remove(item)
+        
+        # Keep the pretty-printed layout of rss_str(pretty=True)
+        channel[-1].tail = "\n    "
+        for item in ordered:
+            item.tail = "\n    "
+        ordered[-1].tail = "\n  "
+        channel.extend(ordered)
+    
     def generate_feed(self, entries):
         """
         Generate RSS feed with entries ordered from newest to oldest.
@@ -120,96 +262,65 @@ class RSSGenerator:
         fg.language(RSS_LANGUAGE)
         fg.lastBuildDate(datetime.now(timezone.utc))
 
+        # Prepare entry fields before touching the feed. This is GIL-bound pure
+        # Python, so it runs serially (a thread pool measured slower)
+        prepared = [self._prepare_entry(i, entry) for i, entry in enumerate(entries)]
+
+        # Items whose rendered fields are unchanged are copied from the previous file
+        existing_items = self._load_existing_items()
+        reused_items = {}
+
+        # FeedGenerator is not thread-safe, so entries are added serially in order
         added_count = 0
-        for i, entry in enumerate(entries):
+        generated_indices = []
+        for index, (entry, fields) in enumerate(zip(entries, prepared)):
+            if fields is None:
+                continue
+            old_item = existing_items.pop(entry["link"], None)
+            if old_item is not None and self._item_matches(old_item, fields):
+                reused_items[index] = old_item
+                added_count += 1
+                continue
             try:
-                # Convert LaTeX accents to Unicode
-                title = latex_to_unicode(entry.get("title", "Untitled"))
-                authors = latex_to_unicode(entry.get("authors", "Unknown"))
-                abstract = latex_to_unicode(entry.get("abstract", "No abstract available"))
-                
                 fe = fg.add_entry()
-                fe.title(title)
+                fe.title(fields["title"])
                 fe.link(href=entry["link"])
-                
-                # Build description
-                arxiv_id = entry["link"].rsplit("/", 1)[-1]
-                
-                # Handle publication date
-                pubdate = entry.get("pubdate")
-                if pubdate:
-                    formatted_date = format_date_for_rss(pubdate)
-                    if formatted_date:
-                        fe.pubDate(formatted_date)
-                        try:
-                            # Parse date for display
-                            if 'T' in pubdate and pubdate.endswith('Z'):
-                                dt = datetime.strptime(pubdate, "%Y-%m-%dT%H:%M:%SZ")
-                            else:
-                                dt = parsedate_to_datetime(pubdate)
-                            display_date = dt.strftime("%a, %d %b %Y %H:%M:%S")
-                        except:
-                            display_date = pubdate
-                    else:
-                        # Fallback to current time
-                        current_time = datetime.now(timezone.utc)
-                        fe.pubDate(current_time.strftime("%a, %d %b %Y %H:%M:%S %z"))
-                        display_date = "Unknown"
-                else:
-                    # Use current time if no publication date
-                    current_time = datetime.now(timezone.utc)
-                    fe.pubDate(current_time.strftime("%a, %d %b %Y %H:%M:%S %z"))
-                    display_date = "Unknown"
-                    logging.warning(f"No pubdate for entry: {entry['link']}")
-                
-                # Log dates for first few entries to verify sorting
-                if i < 3:
-                    logging.info(f"Entry {i+1} date: {display_date}")
-                
-                # Create description
-                description = f"<b>Author(s):</b> {authors}<br><br><b>Abstract:</b> {abstract}<br><br><b>[<a href='{entry['link']}'>arXiv:{arxiv_id}</a>] Published {display_date} UTC</b>"
-                fe.description(description)
-                    
+                fe.pubDate(fields["pubdate"])
+                fe.description(fields["description"])
                 fe.guid(entry["link"])
+                generated_indices.append(index)
                 added_count += 1
 
             except Exception as e:
-                logging.error(f"Failed to add entry {entry['link']}: {e}")
+                logging.error("Failed to add entry %s: %s", entry['link'], e)
 
         # Generate RSS string and parse as XML
         try:
             rss_str = fg.rss_str(pretty=True)
             root = ET.fromstring(rss_str)
-            ns = {'dc': 'http://purl.org/dc/elements/1.1/'}
-            ET.register_namespace('dc', ns['dc'])
         except Exception as e:
             logging.error(f"Failed to parse generated RSS string: {e}")
             return False
             
-        # Add dc:creator elements
-        for item in root.findall(".//item"):
+        if reused_items:
+            logging.info(f"Reused {len(reused_items)} unchanged RSS items, rendered {len(generated_indices)}")
+
+        # Add dc:creator elements from the authors computed in _prepare_entry;
+        # FeedGenerator prepends entries, so its items come out in reverse add order
+        channel = root.find("channel")
+        generated_items = channel.findall("item")
+        for index, item in zip(generated_indices, reversed(generated_items)):
             try:
-                description = item.findtext("description", "")
-                # Extract authors from description using simple string splitting
-                authors = ""
-                if "Author(s):" in description:
-                    # Extract text between "Author(s):" and "Abstract:"
-                    try:
-                        soup = BeautifulSoup(description, "html.parser")
-                        text = soup.get_text()
-                        start = text.find("Author(s):") + len("Author(s):")
-                        end = text.find("Abstract:")
-                        if start > 10 and end > start:  # Valid indices
-                            authors = text[start:end].strip()
-                    except Exception:
-                        pass
-                
-                # Add dc:creator element
-                creator = ET.Element("{http://purl.org/dc/elements/1.1/}creator")
-                creator.text = authors or "Unknown"
-                item.append(creator)
+                creator = ET.SubElement(item, DC_CREATOR_TAG)
+                creator.text = prepared[index]["creator"]
             except Exception as e:
-                logging.warning(f"Failed to add dc:creator: {e}")
+                logging.warning("Failed to add dc:creator: %s", e)
+        
+        if reused_items:
+            self._merge_items(channel, generated_items, generated_indices, reused_items)
+        
+        # Declare the dc prefix once on <rss> instead of on every dc:creator
+        ET.cleanup_namespaces(root, top_nsmap={"dc": DC_NAMESPACE})
             
         # Create output directory and write file
         try:
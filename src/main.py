@@ -12,14 +12,24 @@ License: MIT
 """
 
 import os
+import re
 import sys
 import time
+import queue
+import atexit
+import shutil
+import filecmp
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import our modular components
 from .config import (
-    TARGET_URL, OUTPUT_RSS_PATH, OUTPUT_HTML_PATH, CACHE_PATH, USER_AGENT, MAX_ENTRIES
+    TARGET_URL, OUTPUT_RSS_PATH, OUTPUT_HTML_PATH, CACHE_PATH, USER_AGENT, MAX_ENTRIES,
+    HTTP_POOL_SIZE, ARXIV_RETRY_COUNT, KATEX_CACHE_PATH, CONSOLE_LOG_LEVEL, ARXIV_CACHE_PATH, ARXIV_CACHE_TTL_DAYS
 )
 from .utils.arxiv_processor import ArXivProcessor, DMRGPageParser
 from .utils.cache_manager import CacheManager
@@ -27,6 +37,9 @@ from .utils.entry_sync import EntrySync
 from .generators.rss_generator import RSSGenerator
 from .generators.html_generator import HTMLGenerator
 
+# Base page name (e.g. 'condmat25') from TARGET_URL, used for canonical publishing paths
+_BASE_NAME_RE = re.compile(r'/([^/]+)\.html$')
+
 
 class DMRGRSSApplication:
     """Main application class for DMRG RSS generation."""
@@ -38,18 +51,37 @@ class DMRGRSSApplication:
         self.setup_components()
     
     def setup_logging(self):
-        """Configure logging with detailed output to both console and file."""
+        """
+        Configure logging to console and file.
+        
+        Records are handed to a background QueueListener so console and file
+        I/O happen off the main thread. The file keeps the full INFO log while
+        the console only shows CONSOLE_LOG_LEVEL and above.
+        """
         # Ensure logs directory exists
         os.makedirs('logs', exist_ok=True)
         
-        logging.basicConfig(
-            level=logging.INFO, 
-            format="%(asctime)s [%(levelname)s] %(message)s",
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler('logs/sync.log', mode='w', encoding='utf-8')
-            ]
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+        
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(CONSOLE_LOG_LEVEL)
+        file_handler = logging.FileHandler('logs/sync.log', mode='w', encoding='utf-8')
+        file_handler.setLevel(logging.INFO)
+        for handler in (console_handler, file_handler):
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        self.log_listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
         )
+        self.log_listener.start()
+        # Flush queued records before the interpreter exits
+        atexit.register(self.log_listener.stop)
+        
+        # The listener's handlers do the formatting; the queue only carries the message
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
         
         logging.info("=== DMRG RSS Application Initialized ===")
     
@@ -57,22 +89,59 @@ class DMRGRSSApplication:
         """Setup HTTP session with proper headers."""
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
+        # Size the connection pool for concurrent arXiv lookups and let urllib3
+        # retry transient failures (with backoff, honoring Retry-After on 429)
+        retry = Retry(
+            total=ARXIV_RETRY_COUNT,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         logging.info(f"HTTP session initialized with User-Agent: {USER_AGENT}")
     
     def setup_components(self):
         """Initialize all application components."""
         # Data processing components
         self.dmrg_parser = DMRGPageParser(self.session)
-        self.arxiv_processor = ArXivProcessor(self.session)
+        self.arxiv_processor = ArXivProcessor(
+            self.session,
+            cache_path=ARXIV_CACHE_PATH,
+            cache_ttl=ARXIV_CACHE_TTL_DAYS * 86400 if ARXIV_CACHE_TTL_DAYS is not None else None
+        )
         self.cache_manager = CacheManager(CACHE_PATH)
         self.entry_sync = EntrySync(self.arxiv_processor, max_entries=MAX_ENTRIES)
         
         # Output generators
         self.rss_generator = RSSGenerator(OUTPUT_RSS_PATH)
-        self.html_generator = HTMLGenerator(OUTPUT_HTML_PATH, skip_numeric_prices=False)
+        self.html_generator = HTMLGenerator(
+            OUTPUT_HTML_PATH, skip_numeric_prices=False, katex_cache_path=KATEX_CACHE_PATH
+        )
         
         logging.info("All application components initialized successfully")
     
+    def _canonical_paths(self):
+        """
+        Map the versioned output files to their canonical publishing paths.
+        
+        Returns:
+            list or None: (versioned path, canonical path, label) tuples, or None
+                if the base name cannot be extracted from TARGET_URL
+        """
+        match = _BASE_NAME_RE.search(TARGET_URL)
+        if not match:
+            return None
+        
+        base_name = match.group(1).rstrip('0123456789')
+        return [
+            (OUTPUT_RSS_PATH, f"docs/{base_name}.xml", 'RSS'),
+            (OUTPUT_HTML_PATH, f"docs/{base_name}.html", 'HTML')
+        ]
+    
     def create_publishing_copies(self):
         """
         Publish canonical copies for the publishing layer (clean URLs).
@@ -82,30 +151,21 @@ class DMRGRSSApplication:
         creation was removed earlier; this routine always uses file copies.
         """
         try:
-            import re
-            
-            # Extract base name and versioned file names
-            match = re.search(r'/([^/]+)\.html$', TARGET_URL)
-            if not match:
+            canonical_paths = self._canonical_paths()
+            if canonical_paths is None:
                 logging.warning("Could not extract base name from TARGET_URL for publishing canonical copies")
                 return
-            
-            base_name = match.group(1).rstrip('0123456789')
-            
-            # Get the versioned filenames from config
-            versioned_xml = OUTPUT_RSS_PATH
-            versioned_html = OUTPUT_HTML_PATH
-            publish_xml = f"docs/{base_name}.xml"
-            publish_html = f"docs/{base_name}.html"
-            
-            import shutil
 
-            # Always copy versioned files to canonical publishing paths
-            for src, dest, name in [
-                (versioned_xml, publish_xml, 'RSS'),
-                (versioned_html, publish_html, 'HTML')
-            ]:
+            # Copy versioned files to canonical publishing paths
+            for src, dest, name in canonical_paths:
                 try:
+                    # Skip the copy when the published file already has the same content
+                    if (os.path.isfile(dest) and not os.path.islink(dest)
+                            and os.path.getsize(dest) == os.path.getsize(src)
+                            and filecmp.cmp(src, dest, shallow=False)):
+                        logging.info(f"{dest} is already up to date ({name})")
+                        continue
+
                     # If dest exists (symlink or file), remove it first
                     if os.path.lexists(dest):
                         old_target = os.readlink(dest) if os.path.islink(dest) else 'file'
@@ -114,7 +174,8 @@ class DMRGRSSApplication:
 
                     # Ensure destination directory exists
                     os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    shutil.copy2(src, dest)
+                    # copyfile uses os.sendfile on Linux; metadata is not needed
+                    shutil.copyfile(src, dest)
                     logging.info(f"Copied {src} -> {dest} for publishing ({name})")
 
                 except Exception as e:
@@ -138,11 +199,11 @@ class DMRGRSSApplication:
         
         try:
             # Step 1: Fetch and parse DMRG page
-            soup = self.dmrg_parser.fetch_page(TARGET_URL)
-            if not soup:
+            links = self.dmrg_parser.fetch_page(TARGET_URL)
+            if links is None:
                 raise RuntimeError("Failed to fetch DMRG page")
 
-            dmrg_entries = self.dmrg_parser.parse_entries(soup)
+            dmrg_entries = self.dmrg_parser.parse_entries(links)
             if not dmrg_entries:
                 raise RuntimeError("No arXiv entries found on DMRG page")
 
@@ -154,16 +215,19 @@ class DMRGRSSApplication:
                 dmrg_entries, {}, cached_entries  # existing_rss_entries no longer used
             )
 
-            # Step 4: Save updated cache
-            self.cache_manager.save_cache(updated_cache)
-
-            # Step 5: Generate RSS feed
-            if not self.rss_generator.generate_feed(all_entries):
-                raise RuntimeError("Failed to generate RSS feed")
+            # Steps 4-6: Save updated cache, generate RSS feed and HTML page.
+            # They only read the synced entries and write separate files, so
+            # their disk I/O and KaTeX work overlap.
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                cache_future = executor.submit(self.cache_manager.save_cache, updated_cache)
+                rss_future = executor.submit(self.rss_generator.generate_feed, all_entries)
+                html_future = executor.submit(self.html_generator.generate_html, all_entries)
 
-            # Step 6: Generate HTML page
-            if not self.html_generator.generate_html(all_entries):
-                raise RuntimeError("Failed to generate HTML page")
+                cache_future.result()
+                if not rss_future.result():
+                    raise RuntimeError("Failed to generate RSS feed")
+                if not html_future.result():
+                    raise RuntimeError("Failed to generate HTML page")
 
             # Step 7: Publish canonical copies for clean URLs
             self.create_publishing_copies()
@@ -177,6 +241,11 @@ class DMRGRSSApplication:
         except Exception as e:
             logging.error(f"Full sync failed: {e}")
             return False
+        
+        finally:
+            # Persist fetched metadata and rendered formulas for the next run
+            self.arxiv_processor.close()
+            self.html_generator.close()
     
     def log_sync_statistics(self, all_entries, updated_cache, execution_time):
         """
@@ -192,17 +261,18 @@ class DMRGRSSApplication:
         cache_count = len(updated_cache)
         new_count = existing_count - (cache_count if cache_count < existing_count else 0)
         
+        # Lazy %-formatting: nothing is formatted when INFO records are dropped
         logging.info("=== Sync Statistics ===")
-        logging.info(f"Total execution time: {execution_time:.2f} seconds")
-        logging.info(f"Total entries in RSS/HTML: {existing_count}")
-        logging.info(f"New or updated entries: {max(0, new_count)}")
-        logging.info(f"Cache entries: {cache_count}")
+        logging.info("Total execution time: %.2f seconds", execution_time)
+        logging.info("Total entries in RSS/HTML: %d", existing_count)
+        logging.info("New or updated entries: %d", max(0, new_count))
+        logging.info("Cache entries: %d", cache_count)
         logging.info("=== Full Sync Complete ===")
-        logging.info(f"Generated versioned files:")
-        logging.info(f"  RSS: {OUTPUT_RSS_PATH}")
-        logging.info(f"  HTML: {OUTPUT_HTML_PATH}")
-        logging.info(f"  Cache: {CACHE_PATH}")
-    logging.info("Note: Publishing canonical copies are created for clean URLs")
+        logging.info("Generated versioned files:")
+        logging.info("  RSS: %s", OUTPUT_RSS_PATH)
+        logging.info("  HTML: %s", OUTPUT_HTML_PATH)
+        logging.info("  Cache: %s", CACHE_PATH)
+        logging.info("Note: Publishing canonical copies are created for clean URLs")
     
     def get_status(self):
         """
@@ -216,15 +286,16 @@ class DMRGRSSApplication:
             "files": {}
         }
         
-        # Check output files
+        # Check output files (one stat call per file)
         for file_path, name in [(OUTPUT_RSS_PATH, "rss"), (OUTPUT_HTML_PATH, "html")]:
-            if os.path.exists(file_path):
+            try:
+                st = os.stat(file_path)
                 status["files"][name] = {
                     "exists": True,
-                    "size": os.path.getsize(file_path),
-                    "modified": os.path.getmtime(file_path)
+                    "size": st.st_size,
+                    "modified": st.st_mtime
                 }
-            else:
+            except FileNotFoundError:
                 status["files"][name] = {"exists": False}
         
         return status
@@ -2,107 +2,388 @@
 """
 ArXiv data processor for fetching and parsing paper details.
 """
+import os
+import re
 import time
+import sqlite3
 import logging
+import threading
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import format_datetime
+from lxml import etree as ET
 
-from .text_utils import clean_text, generate_entry_id
-from ..config import ARXIV_API_TIMEOUT, ARXIV_RETRY_COUNT, ARXIV_DELAY_SECONDS
+from .text_utils import clean_text, generate_entry_id, parse_iso_utc, is_entry_complete
+from ..config import (
+    ARXIV_API_TIMEOUT, ARXIV_DELAY_SECONDS, ARXIV_MAX_WORKERS, ARXIV_BATCH_SIZE
+)
+
+_VERSION_SUFFIX_RE = re.compile(r'v\d+$')
+
+# arXiv IDs are the URL path after this marker, e.g. 2401.00001v2 or cond-mat/0101001
+ARXIV_ABS_PREFIX = "/abs/"
+
+# Clark-notation tags for the arXiv Atom feed
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_TAG_ENTRY = _ATOM_NS + "entry"
+_TAG_ID = _ATOM_NS + "id"
+_TAG_TITLE = _ATOM_NS + "title"
+_TAG_SUMMARY = _ATOM_NS + "summary"
+_TAG_PUBLISHED = _ATOM_NS + "published"
+_TAG_AUTHOR = _ATOM_NS + "author"
+_TAG_NAME = _ATOM_NS + "name"
+
+# First link inside a <b> tag on the DMRG page, captured only if it points at arXiv.
+# Tags without an href (e.g. <i>, <a name=...>) may precede the link; </b> may not.
+_ARXIV_B_RE = re.compile(
+    rb'<b\b[^>]*>[^<]*'
+    rb'(?:<(?!/b\s*>|a\s[^>]*\bhref\b)[^>]*>[^<]*)*'
+    rb'<a\s[^>]*\bhref\s*=\s*["\']?(http://arxiv\.org/abs/[^"\'\s>]+)',
+    re.IGNORECASE
+)
+_B_CLOSE_RE = re.compile(rb'</b\s*>', re.IGNORECASE)
+
+DMRG_ARXIV_LINK_PREFIX = "http://arxiv.org/abs/"
+
+# Bytes read from the DMRG page response per streaming step
+PAGE_CHUNK_SIZE = 65536
 
 
 class ArXivProcessor:
     """Handles fetching and processing of arXiv paper data."""
     
-    def __init__(self, session):
+    def __init__(self, session, max_workers=ARXIV_MAX_WORKERS, cache_path=None, cache_ttl=None):
         """
         Initialize ArXiv processor.
         
         Args:
             session (requests.Session): HTTP session for requests
+            max_workers (int): Maximum number of concurrent arXiv requests
+            cache_path (str, optional): SQLite file for caching paper metadata
+                across runs (None = no disk cache)
+            cache_ttl (float, optional): Seconds before cached metadata is
+                fetched again (None = never expires)
         """
         self.session = session
+        self.max_workers = max_workers
+        
+        # Shared rate limiter: request starts are spaced by ARXIV_DELAY_SECONDS
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        
+        # lxml parsers are reused per thread rather than shared between fetch_many() workers
+        self._xml_parsers = threading.local()
+        
+        self.cache_ttl = cache_ttl
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            self._open_cache(cache_path)
     
-    def fetch_paper_details(self, arxiv_url, retry_count=ARXIV_RETRY_COUNT):
+    def _xml_parser(self):
+        """Return this thread's reusable XML parser for API responses."""
+        parser = getattr(self._xml_parsers, "parser", None)
+        if parser is None:
+            # Whitespace between Atom elements is ignorable, so skip building those text nodes
+            parser = self._xml_parsers.parser = ET.XMLParser(remove_blank_text=True)
+        return parser
+    
+    def _fetch_feed(self, api_url):
         """
-        Fetch paper details from arXiv API with retry mechanism.
+        Request an arXiv API query and parse the Atom response as it streams in.
+        
+        The body is fed to lxml straight from the socket, so the raw XML is never
+        held as one bytes object next to the parsed tree.
         
         Args:
-            arxiv_url (str): URL to the arXiv paper
-            retry_count (int): Number of retry attempts
+            api_url (str): arXiv API query URL
+            
+        Returns:
+            Element: Root <feed> element of the response
+        """
+        with self.session.get(api_url, timeout=ARXIV_API_TIMEOUT, stream=True) as r:
+            r.raise_for_status()
+            # Undo any gzip Content-Encoding while lxml reads from the raw stream
+            r.raw.decode_content = True
+            return ET.parse(r.raw, self._xml_parser()).getroot()
+    
+    def _open_cache(self, cache_path):
+        """
+        Open (or create) the on-disk metadata cache.
+        
+        Args:
+            cache_path (str): Path to the SQLite cache file
+        """
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            # Accessed from fetch_many() worker threads, guarded by _cache_lock
+            self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS papers ("
+                "arxiv_id TEXT PRIMARY KEY, title TEXT NOT NULL, abstract TEXT NOT NULL, "
+                "pubdate TEXT, authors TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            count = self._cache.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            logging.info(f"arXiv metadata cache opened: {cache_path} ({count} papers)")
+        except Exception as e:
+            logging.warning(f"arXiv metadata cache disabled, failed to open {cache_path}: {e}")
+            self._cache = None
+    
+    def _cache_get(self, arxiv_id):
+        """Return cached (title, abstract, pubdate, authors) for arxiv_id, or None."""
+        if self._cache is None:
+            return None
+        with self._cache_lock:
+            row = self._cache.execute(
+                "SELECT title, abstract, pubdate, authors, fetched_at FROM papers WHERE arxiv_id = ?",
+                (arxiv_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.cache_ttl is not None and time.time() - row[4] > self.cache_ttl:
+            return None
+        return row[:4]
+    
+    def _cache_put(self, arxiv_id, details):
+        """Store successfully fetched paper details under arxiv_id."""
+        if self._cache is None:
+            return
+        # Partial results (e.g. no pubdate) are not cached, so EntrySync's
+        # refetch of incomplete entries reaches the API again
+        title, abstract, pubdate, authors = details
+        if not is_entry_complete({"title": title, "abstract": abstract, "pubdate": pubdate, "authors": authors}):
+            return
+        with self._cache_lock:
+            try:
+                self._cache.execute(
+                    "INSERT OR REPLACE INTO papers "
+                    "(arxiv_id, title, abstract, pubdate, authors, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (arxiv_id, *details, time.time())
+                )
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to store {arxiv_id} in arXiv metadata cache: {e}")
+    
+    def close(self):
+        """
+        Flush and close the on-disk metadata cache.
+        """
+        if self._cache is None:
+            return
+        
+        with self._cache_lock:
+            try:
+                self._cache.commit()
+                logging.info("arXiv metadata cache saved")
+            except Exception as e:
+                logging.warning(f"Failed to save arXiv metadata cache: {e}")
+            finally:
+                self._cache.close()
+                self._cache = None
+    
+    def _wait_for_rate_limit(self):
+        """Block until the next arXiv API request is allowed to start."""
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_time)
+            self._next_request_time = start + ARXIV_DELAY_SECONDS
+        if start > now:
+            time.sleep(start - now)
+    
+    def fetch_many(self, arxiv_urls, batch_size=ARXIV_BATCH_SIZE, arxiv_ids=None):
+        """
+        Fetch details for several papers using batched, concurrent API queries.
+        
+        IDs are grouped into id_list queries of batch_size papers; batches run
+        concurrently but share the session's connection pool and the rate
+        limiter. Papers missing from a batch response are fetched one by one;
+        papers found in the metadata cache are not requested.
+        
+        Args:
+            arxiv_urls (list): URLs to the arXiv papers
+            batch_size (int): Number of papers per API query
+            arxiv_ids (list, optional): arXiv IDs of the papers, if already known
+                (e.g. from DMRGPageParser.parse_entries)
+            
+        Returns:
+            list: (title, abstract, pubdate, authors) tuples in input order
+        """
+        if arxiv_ids is None:
+            arxiv_ids = [self._extract_arxiv_id(url) for url in arxiv_urls]
+        total = len(arxiv_urls)
+        results = [None] * total
+        
+        # Papers already in the metadata cache need no request at all
+        missing = []
+        for i, arxiv_id in enumerate(arxiv_ids):
+            results[i] = self._cache_get(arxiv_id)
+            if results[i] is None:
+                missing.append(i)
+        if len(missing) < total:
+            logging.info("Served %d of %d papers from the arXiv metadata cache", total - len(missing), total)
+        if not missing:
+            return results
+        
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        
+        def fetch_batch(indices):
+            found = self.fetch_paper_details_batch([arxiv_ids[i] for i in indices])
+            return [
+                found.get(arxiv_ids[i]) or self.fetch_paper_details(arxiv_urls[i], arxiv_ids[i])
+                for i in indices
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            futures = {executor.submit(fetch_batch, indices): indices for indices in batches}
+            done = 0
+            for future in as_completed(futures):
+                indices = futures[future]
+                for i, details in zip(indices, future.result()):
+                    results[i] = details
+                done += len(indices)
+                logging.info("Fetched details [%d/%d]", done, len(missing))
+        
+        return results
+    
+    def fetch_paper_details_batch(self, arxiv_ids):
+        """
+        Fetch details for up to ARXIV_BATCH_SIZE papers with a single id_list query.
+        
+        Transient HTTP failures are retried by the session's HTTPAdapter.
+        
+        Args:
+            arxiv_ids (list): arXiv IDs of the papers
+            
+        Returns:
+            dict: (title, abstract, pubdate, authors) tuples indexed by arXiv ID;
+                papers missing from the response (or a failed batch) are omitted
+        """
+        wanted = {self._strip_version(arxiv_id): arxiv_id for arxiv_id in arxiv_ids}
+        api_url = (
+            f"http://export.arxiv.org/api/query?id_list={','.join(arxiv_ids)}"
+            f"&max_results={len(arxiv_ids)}"
+        )
+        
+        try:
+            self._wait_for_rate_limit()
+            logging.info(f"Fetching arXiv details for batch of {len(arxiv_ids)}")
+            root = self._fetch_feed(api_url)
+            
+            details = {}
+            for entry in root.findall(_TAG_ENTRY):
+                entry_id = (entry.findtext(_TAG_ID) or "").rstrip("/")
+                arxiv_id = wanted.get(self._strip_version(entry_id.split(ARXIV_ABS_PREFIX)[-1]))
+                if arxiv_id is not None:
+                    details[arxiv_id] = self._parse_entry(entry)
+                    self._cache_put(arxiv_id, details[arxiv_id])
+            
+            if len(details) < len(arxiv_ids):
+                logging.warning(f"Batch response missing {len(arxiv_ids) - len(details)} of {len(arxiv_ids)} papers")
+            return details
+            
+        except Exception as e:
+            logging.error(f"Batch request failed, falling back to per-paper requests: {e}")
+            return {}
+    
+    def _extract_arxiv_id(self, arxiv_url):
+        """Extract the arXiv ID (the path after /abs/, e.g. 'cond-mat/0101001') from a paper URL."""
+        arxiv_url = arxiv_url.rstrip("/")
+        if ARXIV_ABS_PREFIX in arxiv_url:
+            return arxiv_url.split(ARXIV_ABS_PREFIX, 1)[1]
+        return arxiv_url.split("/")[-1]
+    
+    def _strip_version(self, arxiv_id):
+        """Remove a trailing version suffix (e.g. 'v2') from an arXiv ID."""
+        return _VERSION_SUFFIX_RE.sub("", arxiv_id)
+    
+    def _parse_entry(self, entry):
+        """
+        Extract paper details from an Atom <entry> element.
+        
+        Args:
+            entry (Element): Atom entry from the arXiv API response
             
         Returns:
             tuple: (title, abstract, pubdate, authors)
         """
-        for attempt in range(retry_count):
+        # Extract title
+        title_el = entry.find(_TAG_TITLE)
+        title = clean_text(title_el.text if title_el is not None else "")
+
+        # Extract abstract - need to handle LaTeX with < and > properly
+        abstract_el = entry.find(_TAG_SUMMARY)
+        if abstract_el is not None:
+            # Serialize all text including nested elements in C (etree elements have no
+            # text_content()); this handles LaTeX formulas like $1<c<2$
+            abstract_text = ET.tostring(abstract_el, method="text", encoding="unicode", with_tail=False)
+            abstract = clean_text(abstract_text)
+        else:
+            abstract = ""
+
+        # Extract publication date
+        published_el = entry.find(_TAG_PUBLISHED)
+        pubdate = None
+        if published_el is not None:
             try:
-                arxiv_id = arxiv_url.rstrip("/").split("/")[-1]
-                api_url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
-                
-                logging.info(f"Fetching arXiv details (attempt {attempt + 1}): {arxiv_id}")
-                r = self.session.get(api_url, timeout=ARXIV_API_TIMEOUT)
-                r.raise_for_status()
-                
-                root = ET.fromstring(r.content)
-    
-                # Check for errors
-                entries = root.findall(".//{http://www.w3.org/2005/Atom}entry")
-                if not entries:
-                    logging.warning(f"No entry found for {arxiv_id}")
-                    if attempt < retry_count - 1:
-                        time.sleep(ARXIV_DELAY_SECONDS)
-                        continue
-                    return "", "", None, ""
-    
-                entry = entries[0]
-    
-                # Extract title
-                title_el = entry.find(".//{http://www.w3.org/2005/Atom}title")
-                title = clean_text(title_el.text if title_el is not None else "")
-    
-                # Extract abstract - need to handle LaTeX with < and > properly
-                abstract_el = entry.find(".//{http://www.w3.org/2005/Atom}summary")
-                if abstract_el is not None:
-                    # Use itertext() to get all text including nested elements
-                    # This handles cases where LaTeX formulas like $1<c<2$ are present
-                    abstract_text = ''.join(abstract_el.itertext())
-                    abstract = clean_text(abstract_text)
-                else:
-                    abstract = ""
-    
-                # Extract publication date
-                published_el = entry.find(".//{http://www.w3.org/2005/Atom}published")
+                # Parse the fixed YYYY-MM-DDTHH:MM:SSZ layout, then convert to RFC-2822 for RSS
+                pubdate = format_datetime(parse_iso_utc(published_el.text))
+                logging.debug("Parsed pubdate: %s", pubdate)
+            except Exception as e:
+                logging.warning(f"Failed to parse pubdate {published_el.text}: {e}")
                 pubdate = None
-                if published_el is not None:
-                    try:
-                        # Validate date format and convert to RFC-2822 format for RSS
-                        dt = datetime.strptime(published_el.text, "%Y-%m-%dT%H:%M:%SZ")
-                        dt = dt.replace(tzinfo=timezone.utc)
-                        pubdate = dt.strftime("%a, %d %b %Y %H:%M:%S %z")
-                        logging.debug(f"Parsed pubdate: {pubdate}")
-                    except Exception as e:
-                        logging.warning(f"Failed to parse pubdate {published_el.text}: {e}")
-                        pubdate = None
-    
-                # Extract authors
-                authors_list = entry.findall(".//{http://www.w3.org/2005/Atom}author")
-                authors = ", ".join([
-                    clean_text(a.findtext("{http://www.w3.org/2005/Atom}name", ""))
-                    for a in authors_list
-                ])
-    
-                logging.info(f"Successfully fetched details for {arxiv_id}: '{title[:50]}...'")
-                return title, abstract, pubdate, authors
+
+        # Extract authors
+        authors_list = entry.findall(_TAG_AUTHOR)
+        authors = ", ".join([
+            clean_text(a.findtext(_TAG_NAME, ""))
+            for a in authors_list
+        ])
+        
+        return title, abstract, pubdate, authors
     
-            except Exception as e:
-                logging.warning(f"Attempt {attempt + 1} failed for {arxiv_url}: {e}")
-                if attempt < retry_count - 1:
-                    time.sleep(ARXIV_DELAY_SECONDS)
-                else:
-                    logging.error(f"All attempts failed for {arxiv_url}")
-                    return "", "", None, ""
+    def fetch_paper_details(self, arxiv_url, arxiv_id=None):
+        """
+        Fetch paper details from arXiv API.
+        
+        Transient HTTP failures (connection errors, 429 and 5xx responses) are
+        retried by the session's HTTPAdapter, honoring Retry-After.
+        
+        Args:
+            arxiv_url (str): URL to the arXiv paper
+            arxiv_id (str, optional): arXiv ID of the paper, if already known
+            
+        Returns:
+            tuple: (title, abstract, pubdate, authors)
+        """
+        if arxiv_id is None:
+            arxiv_id = self._extract_arxiv_id(arxiv_url)
+        cached = self._cache_get(arxiv_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            api_url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
+            
+            self._wait_for_rate_limit()
+            logging.info(f"Fetching arXiv details: {arxiv_id}")
+            root = self._fetch_feed(api_url)
+
+            # Check for errors
+            entries = root.findall(_TAG_ENTRY)
+            if not entries:
+                logging.warning(f"No entry found for {arxiv_id}")
+                return "", "", None, ""
+
+            title, abstract, pubdate, authors = self._parse_entry(entries[0])
+
+            logging.info(f"Successfully fetched details for {arxiv_id}: '{title[:50]}...'")
+            self._cache_put(arxiv_id, (title, abstract, pubdate, authors))
+            return title, abstract, pubdate, authors
+
+        except Exception as e:
+            logging.error(f"Failed to fetch details for {arxiv_url}: {e}")
+            return "", "", None, ""
 
 
 class DMRGPageParser:
@@ -119,51 +400,63 @@ class DMRGPageParser:
     
     def fetch_page(self, url, timeout=30):
         """
-        Fetch web page content.
+        Stream the web page and extract its arXiv links while downloading.
         
         Args:
             url (str): URL to fetch
             timeout (int): Request timeout in seconds
             
         Returns:
-            BeautifulSoup or None: Parsed HTML content or None on error
+            list or None: arXiv links in page order, or None on error
         """
         try:
             logging.info(f"Fetching page: {url}")
-            r = self.session.get(url, timeout=timeout)
-            r.raise_for_status()
-            logging.info(f"Successfully fetched page, size: {len(r.content)} bytes")
-            return BeautifulSoup(r.content, "html.parser")
+            with self.session.get(url, timeout=timeout, stream=True) as r:
+                r.raise_for_status()
+                links = []
+                size = 0
+                pending = b""
+                for chunk in r.iter_content(chunk_size=PAGE_CHUNK_SIZE):
+                    size += len(chunk)
+                    pending += chunk
+                    # Every <b> opened before the last </b> is complete, so match up to
+                    # there and keep only the tail for the next chunk
+                    last_close = None
+                    for last_close in _B_CLOSE_RE.finditer(pending):
+                        pass
+                    if last_close is not None:
+                        links.extend(self._match_links(pending, last_close.end()))
+                        pending = pending[last_close.end():]
+                links.extend(self._match_links(pending, len(pending)))
+            logging.info(f"Successfully fetched page, size: {size} bytes")
+            return links
         except Exception as e:
             logging.error("Failed to fetch page %s: %s", url, e)
             return None
     
-    def parse_entries(self, soup):
+    def _match_links(self, content, end):
+        """Return the arXiv links of the bold tags in content[:end]."""
+        return [
+            match.group(1).decode("utf-8", "replace")
+            for match in _ARXIV_B_RE.finditer(content, 0, end)
+        ]
+    
+    def parse_entries(self, links):
         """
-        Parse all arXiv links from DMRG page.
+        Build entries from the arXiv links found on the DMRG page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML content
+            links (list): arXiv links returned by fetch_page
             
         Returns:
-            list: List of entry dictionaries with id and link
+            list: List of entry dictionaries with id, link and arxiv_id
         """
-        entries = []
-        b_tags = soup.find_all("b")
-        logging.info(f"Found {len(b_tags)} bold tags to check")
-        
-        for i, b_tag in enumerate(b_tags):
-            a_tag = b_tag.find("a", href=True)
-            if not a_tag or not a_tag["href"].startswith("http://arxiv.org/abs/"):
-                continue
-            
-            href = a_tag["href"]
-            entry_id = generate_entry_id(href)
-            entries.append({"id": entry_id, "link": href})
-            
-            # Log progress less frequently to reduce noise in logs (every 200 entries)
-            if (i + 1) % 200 == 0:
-                logging.info(f"Processed {i + 1} bold tags, found {len(entries)} arXiv links so far")
+        # The regex only matches http://arxiv.org/abs/ links, so the ID is a plain slice
+        id_start = len(DMRG_ARXIV_LINK_PREFIX)
+        entries = [
+            {"id": generate_entry_id(href), "link": href, "arxiv_id": href[id_start:].rstrip("/")}
+            for href in links
+        ]
         
         logging.info(f"Total arXiv entries found: {len(entries)}")
         return entries
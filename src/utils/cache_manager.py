@@ -2,11 +2,30 @@
 """
 Cache management module for storing and retrieving processed entries.
 Supports dual-file caching: entries_latest.json (current) and entries_YYYY.json (yearly backup).
+A small .meta sidecar keeps entry counts for get_cache_stats.
 """
 import os
+import sys
 import json
+import time
 import logging
-from datetime import datetime, timezone
+
+try:
+    import orjson
+except ImportError:
+    # Optional: the stdlib encoder writes the same bytes, just slower
+    orjson = None
+
+# Buffer size for cache file I/O
+IO_BUFFER_SIZE = 65536
+
+# Current year (last 2 digits), computed once per process rather than per instance
+_CURRENT_YEAR_2DIGIT = str(time.localtime().tm_year)[-2:]
+
+
+def _utc_timestamp():
+    """Current UTC time as ISO 8601 (e.g. 2025-01-02T03:04:05Z), formatted by C-level strftime."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 class CacheManager:
@@ -21,14 +40,16 @@ class CacheManager:
                 - "docs/entries25.json" → current data (dual files: entries25.json + entries25.json)
                 - "docs/entries24.json" → year-specific data (keep as entries24.json)
         """
-        self.cache_dir = os.path.dirname(cache_path) if os.path.dirname(cache_path) else "."
+        self.cache_dir = os.path.dirname(cache_path) or "."
         cache_filename = os.path.basename(cache_path)
         
         # Detect if this is a year-specific cache (entries{YY}.json)
         # Pattern: entriesYYYY.json or entriesYY.json where YY/YYYY are digits
         self.is_year_specific = False
         self.target_year = None
-        self.current_year_2digit = str(datetime.now().year)[-2:]
+        self.current_year_2digit = _CURRENT_YEAR_2DIGIT
+        # Current-year cache: the default path and the year-specific fallback
+        self._fallback_path = os.path.join(self.cache_dir, f"entries{self.current_year_2digit}.json")
         
         if cache_filename.startswith("entries") and cache_filename.endswith(".json"):
             # Extract the middle part (e.g., "24" from "entries24.json")
@@ -48,13 +69,125 @@ class CacheManager:
                     self.yearly_cache_path = cache_path  # Same file
             else:
                 # Invalid format, use current year
-                self.cache_path = os.path.join(self.cache_dir, f"entries{self.current_year_2digit}.json")
+                self.cache_path = self._fallback_path
                 self.yearly_cache_path = self.cache_path
         else:
             # Default to current year cache
-            self.cache_path = os.path.join(self.cache_dir, f"entries{self.current_year_2digit}.json")
+            self.cache_path = self._fallback_path
             self.yearly_cache_path = self.cache_path
     
+    def _meta_path(self, path):
+        """Path of the stats sidecar belonging to a cache file (entries25.json -> entries25.json.meta)."""
+        return path + ".meta"
+    
+    def _write_meta(self, entry_count, last_updated):
+        """
+        Record entry count and file size of the saved cache in its sidecar.
+        
+        The size lets _get_cache_file_stats detect a sidecar that no longer
+        matches the cache (e.g. after a checkout) and fall back to a full read.
+        
+        Args:
+            entry_count (int): Number of entries just saved
+            last_updated (str): Timestamp written into the cache
+        """
+        meta_path = self._meta_path(self.cache_path)
+        try:
+            meta = {
+                "entry_count": entry_count,
+                "last_updated": last_updated,
+                "file_size": os.path.getsize(self.cache_path)
+            }
+            self._write_json(meta_path, meta)
+        except Exception as e:
+            logging.warning(f"Could not write cache stats sidecar {meta_path}: {e}")
+    
+    def _read_meta(self, path, file_size):
+        """
+        Load the stats sidecar of a cache file if it still matches the cache.
+        
+        Args:
+            path (str): Path to the cache JSON file
+            file_size (int): Current size of the cache file
+            
+        Returns:
+            dict or None: Sidecar contents, or None if missing or stale
+        """
+        try:
+            meta = self._read_json(self._meta_path(path))
+        except (OSError, ValueError):
+            return None
+        
+        if meta.get("file_size") != file_size:
+            return None
+        return meta
+    
+    def _read_entries(self, path):
+        """
+        Load the entries of a cache file.
+        
+        Args:
+            path (str): Path to the cache JSON file
+            
+        Returns:
+            tuple: (entries dict, last_updated)
+        """
+        cache_data = self._read_json(path)
+        entries = cache_data.get('entries', {})
+        last_updated = cache_data.get('last_updated', 'unknown')
+        
+        # Each ID is stored twice (dict key and "id" field); interning lets
+        # both refer to one string object
+        interned = {}
+        for entry_id, entry in entries.items():
+            entry_id = sys.intern(entry_id)
+            if isinstance(entry, dict) and entry.get('id') == entry_id:
+                entry['id'] = entry_id
+            interned[entry_id] = entry
+        
+        return interned, last_updated
+    
+    def _read_json(self, path):
+        """Load a JSON file, using orjson when it is installed."""
+        if orjson is not None:
+            with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+            return json.load(f)
+    
+    def _write_json(self, path, data, pretty=False):
+        """
+        Atomically write data as UTF-8 JSON.
+        
+        The file is written next to path and moved into place with os.replace,
+        so a crash mid-write leaves the previous cache intact. orjson is used
+        when it is installed.
+        
+        Args:
+            path (str): Destination JSON file
+            data (dict): Data to serialize
+            pretty (bool): Indent with 2 spaces for human inspection
+        """
+        # Serialize up front so the file is written with a single write call
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        elif pretty:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+    
     def load_cache(self):
         """
         Load entries from cache file with intelligent fallback.
@@ -71,57 +204,49 @@ class CacheManager:
             dict: Dictionary of cached entries with metadata
         """
         if self.is_year_specific:
-            # Year-specific mode: try year file first, then current year as fallback
-            if os.path.exists(self.cache_path):
-                try:
-                    with open(self.cache_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    entries = cache_data.get('entries', {})
-                    last_updated = cache_data.get('last_updated', 'unknown')
-                    
-                    logging.info(f"Loaded {len(entries)} entries from year-specific cache: {self.cache_path} (last updated: {last_updated})")
-                    return entries
-                    
-                except Exception as e:
-                    logging.error(f"Error loading year-specific cache file: {e}")
+            # Year-specific mode: try year file first, then current year as fallback.
+            # Missing files surface as FileNotFoundError from open(), saving a stat per load.
+            try:
+                entries, last_updated = self._read_entries(self.cache_path)
+                
+                logging.info(f"Loaded {len(entries)} entries from year-specific cache: {self.cache_path} (last updated: {last_updated})")
+                return entries
+                
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Error loading year-specific cache file: {e}")
             
             # Fallback: try current year cache
-            current_year_file = os.path.join(self.cache_dir, f"entries{self.current_year_2digit}.json")
-            if os.path.exists(current_year_file):
-                try:
-                    with open(current_year_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    entries = cache_data.get('entries', {})
-                    last_updated = cache_data.get('last_updated', 'unknown')
-                    
-                    logging.info(f"Loaded {len(entries)} entries from current year cache (fallback): {current_year_file} (last updated: {last_updated})")
-                    return entries
-                    
-                except Exception as e:
-                    logging.error(f"Error loading current year cache: {e}")
+            current_year_file = self._fallback_path
+            try:
+                entries, last_updated = self._read_entries(current_year_file)
+                
+                logging.info(f"Loaded {len(entries)} entries from current year cache (fallback): {current_year_file} (last updated: {last_updated})")
+                return entries
+                
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Error loading current year cache: {e}")
         else:
             # Latest mode: try the specified file
-            if os.path.exists(self.cache_path):
-                try:
-                    with open(self.cache_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    entries = cache_data.get('entries', {})
-                    last_updated = cache_data.get('last_updated', 'unknown')
-                    
-                    logging.info(f"Loaded {len(entries)} entries from cache (last updated: {last_updated})")
-                    return entries
-                    
-                except Exception as e:
-                    logging.error(f"Error loading cache file: {e}")
+            try:
+                entries, last_updated = self._read_entries(self.cache_path)
+                
+                logging.info(f"Loaded {len(entries)} entries from cache (last updated: {last_updated})")
+                return entries
+                
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Error loading cache file: {e}")
         
         # No cache files found
         logging.info(f"No cache files found at {self.cache_path}")
         return {}
     
-    def save_cache(self, entries_dict):
+    def save_cache(self, entries_dict, pretty=True):
         """
         Save entries to cache files based on detection mode.
         
@@ -135,30 +260,26 @@ class CacheManager:
         
         Args:
             entries_dict (dict): Dictionary of entries to cache
+            pretty (bool): Indent the JSON with 2 spaces (the default: the file
+                is committed under docs/, so line-based diffs stay readable)
         """
         try:
-            # Create cache data structure
+            # Ensure directory exists
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
             cache_data = {
-                'last_updated': datetime.now(timezone.utc).isoformat(),
+                'last_updated': _utc_timestamp(),
                 'entries': entries_dict
             }
             
-            # Ensure directory exists
-            os.makedirs(self.cache_dir, exist_ok=True)
-            
             # Save to the cache path (year-specific or current year)
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            self._write_json(self.cache_path, cache_data, pretty)
+            self._write_meta(len(entries_dict), cache_data['last_updated'])
             
             logging.info(f"Saved {len(entries_dict)} entries to cache: {self.cache_path}")
             
         except Exception as e:
             logging.error(f"Error saving cache files: {e}")
-            
-            logging.info(f"Saved {len(entries_dict)} entries to yearly backup: {self.yearly_cache_path}")
-            
-        except Exception as e:
-            logging.error(f"Error saving cache files: {e}")
     
     def get_cache_stats(self):
         """
@@ -184,20 +305,26 @@ class CacheManager:
             dict: Cache file statistics
         """
         try:
-            if not os.path.exists(file_path):
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
                 return {"exists": False}
             
-            file_size = os.path.getsize(file_path)
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            # The sidecar avoids parsing the whole cache just to count entries
+            meta = self._read_meta(file_path, file_size)
+            if meta is not None:
+                entry_count = meta.get("entry_count", 0)
+                last_updated = meta.get("last_updated", "unknown")
+            else:
+                entries, last_updated = self._read_entries(file_path)
+                entry_count = len(entries)
             
             return {
                 "exists": True,
                 "path": file_path,
                 "file_size": file_size,
-                "entry_count": len(cache_data.get('entries', {})),
-                "last_updated": cache_data.get('last_updated', 'unknown')
+                "entry_count": entry_count,
+                "last_updated": last_updated
             }
             
         except Exception as e:
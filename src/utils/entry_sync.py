@@ -2,7 +2,6 @@
 """
 Entry synchronization module for managing data consistency between sources.
 """
-import time
 import logging
 
 from .text_utils import is_entry_complete
@@ -53,48 +52,41 @@ class EntrySync:
             if eid not in cached_entries:
                 # Not in cache - completely new entry
                 new_or_incomplete.append(dmrg_entry)
-                logging.debug(f"New entry not in cache: {dmrg_entry['link']}")
+                logging.debug("New entry not in cache: %s", dmrg_entry['link'])
             else:
                 # In cache - check if complete
                 cached_entry = cached_entries[eid]
                 if is_entry_complete(cached_entry):
                     # Entry is complete in cache
                     complete_existing.append(cached_entry)
-                    logging.debug(f"Complete cached entry: {cached_entry['link']}")
+                    logging.debug("Complete cached entry: %s", cached_entry['link'])
                 else:
                     # Entry exists in cache but is incomplete - needs refetch
                     new_or_incomplete.append(dmrg_entry)
-                    logging.info(f"Incomplete entry in cache, will refetch: {dmrg_entry['link']}")
+                    logging.info("Incomplete entry in cache, will refetch: %s", dmrg_entry['link'])
 
         logging.info(f"Entries analysis: {len(complete_existing)} complete, {len(new_or_incomplete)} need fetching")
         
         if len(new_or_incomplete) == 0:
             logging.info("All entries are complete, no fetching needed")
 
-        # Fetch detailed information for new or incomplete entries
-        detailed_new_entries = []
-        total_to_fetch = len(new_or_incomplete)
+        # Fetch detailed information for new or incomplete entries in one call;
+        # the processor runs the requests concurrently and keeps input order
+        details = self.arxiv_processor.fetch_many(
+            [entry["link"] for entry in new_or_incomplete],
+            arxiv_ids=[entry["arxiv_id"] for entry in new_or_incomplete]
+        )
         
-        for i, entry in enumerate(new_or_incomplete):
-            progress = f"{i+1}/{total_to_fetch}"
-            logging.info(f"Fetching details [{progress}]: {entry['link']}")
-            
-            title, abstract, pubdate, authors = self.arxiv_processor.fetch_paper_details(entry["link"])
-            
-            detailed_entry = {
+        detailed_new_entries = []
+        for entry, (title, abstract, pubdate, authors) in zip(new_or_incomplete, details):
+            detailed_new_entries.append({
                 "id": entry["id"],
                 "link": entry["link"],
                 "title": title,
                 "abstract": abstract,
                 "pubdate": pubdate,
                 "authors": authors
-            }
-            
-            detailed_new_entries.append(detailed_entry)
-            
-            # Add delay for API requests
-            if i < total_to_fetch - 1:
-                time.sleep(2)
+            })
 
         # Merge all entries: keep DMRG page order, complete existing first, then new entries
         all_entries = complete_existing + detailed_new_entries
@@ -3,8 +3,94 @@
 Utility functions for text processing and date handling.
 """
 import re
-from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
+import time
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime, format_datetime
+
+
+# LaTeX accent commands and their Unicode equivalents.
+# Note: JSON stores single backslash as \, so \'{e} appears as \'  {e}.
+# Except for acute and diaeresis the backslash is optional, so both \v{r}
+# and v{r} are converted.
+_LATEX_ACCENTS = {
+    # Háček/Caron: \v{x}
+    r'\v{c}': 'č', r'\v{C}': 'Č',
+    r'\v{d}': 'ď', r'\v{D}': 'Ď',
+    r'\v{e}': 'ě', r'\v{E}': 'Ě',
+    r'\v{l}': 'ľ', r'\v{L}': 'Ľ',
+    r'\v{n}': 'ň', r'\v{N}': 'Ň',
+    r'\v{r}': 'ř', r'\v{R}': 'Ř',
+    r'\v{s}': 'š', r'\v{S}': 'Š',
+    r'\v{t}': 'ť', r'\v{T}': 'Ť',
+    r'\v{z}': 'ž', r'\v{Z}': 'Ž',
+    
+    # Acute: \'{x}
+    r"\'a": 'á', r"\'A": 'Á',
+    r"\'e": 'é', r"\'E": 'É',
+    r"\'i": 'í', r"\'I": 'Í',
+    r"\'o": 'ó', r"\'O": 'Ó',
+    r"\'u": 'ú', r"\'U": 'Ú',
+    r"\'y": 'ý', r"\'Y": 'Ý',
+    r"\'c": 'ć', r"\'C": 'Ć',
+    r"\'n": 'ń', r"\'N": 'Ń',
+    r"\'s": 'ś', r"\'S": 'Ś',
+    r"\'z": 'ź', r"\'Z": 'Ź',
+    
+    # Diaeresis: \"{x}
+    r'\"a': 'ä', r'\"A': 'Ä',
+    r'\"e': 'ë', r'\"E': 'Ë',
+    r'\"i': 'ï', r'\"I': 'Ï',
+    r'\"o': 'ö', r'\"O': 'Ö',
+    r'\"u': 'ü', r'\"U': 'Ü',
+    r'\"y': 'ÿ',
+    
+    # Circumflex: \^{x}
+    r'\^a': 'â', r'\^A': 'Â',
+    r'\^e': 'ê', r'\^E': 'Ê',
+    r'\^i': 'î', r'\^I': 'Î',
+    r'\^o': 'ô', r'\^O': 'Ô',
+    r'\^u': 'û', r'\^U': 'Û',
+    
+    # Tilde: \~{x}
+    r'\~a': 'ã', r'\~A': 'Ã',
+    r'\~n': 'ñ', r'\~N': 'Ñ',
+    r'\~o': 'õ', r'\~O': 'Õ',
+    
+    # Cedilla: \c{x}
+    r'\c{c}': 'ç', r'\c{C}': 'Ç',
+    
+    # Breve: \u{x}
+    r'\u{a}': 'ă', r'\u{A}': 'Ă',
+    r'\u{e}': 'ĕ', r'\u{E}': 'Ĕ',
+    r'\u{i}': 'ĭ', r'\u{I}': 'Ĭ',
+    r'\u{o}': 'ŏ', r'\u{O}': 'Ŏ',
+    r'\u{u}': 'ŭ', r'\u{U}': 'Ŭ',
+    
+    # Double acute: \H{x}
+    r'\H{o}': 'ő', r'\H{O}': 'Ő',
+    r'\H{u}': 'ű', r'\H{U}': 'Ű',
+    
+    # Ogonek: \k{x}
+    r'\k{a}': 'ą', r'\k{A}': 'Ą',
+    r'\k{e}': 'ę', r'\k{E}': 'Ę',
+}
+
+_LATEX_MAP = dict(_LATEX_ACCENTS)
+_LATEX_MAP.update((cmd[1:], char) for cmd, char in _LATEX_ACCENTS.items() if cmd[1] not in "'\"")
+
+# One alternation of all literal forms, longest first so "\v{r}" is preferred over
+# "v{r}"; the text is scanned once instead of once per accent
+_LATEX_RE = re.compile("|".join(re.escape(cmd) for cmd in sorted(_LATEX_MAP, key=len, reverse=True)))
+
+# Runs of whitespace (including newlines) collapsed by clean_text
+_WS_RE = re.compile(r'\s+')
+
+
+def _may_contain_accents(text):
+    """Cheap substring check for characters every accent command contains."""
+    # Backslash-less forms like v{r} and ^a still need "{", "^" or "~"
+    return "\\" in text or "{" in text or "^" in text or "~" in text
 
 
 def latex_to_unicode(text):
@@ -28,80 +114,10 @@ def latex_to_unicode(text):
     Returns:
         str: Text with LaTeX accents converted to Unicode
     """
-    if not text:
+    if not text or not _may_contain_accents(text):
         return text
     
-    # Mapping of LaTeX accent commands to Unicode equivalents
-    # Note: JSON stores single backslash as \, so \'{e} appears as \'  {e}
-    # We need patterns that match both \v{r} and v{r} forms
-    latex_accents = {
-        # Háček/Caron: \v{x}
-        r'\\?v\{c\}': 'č', r'\\?v\{C\}': 'Č',
-        r'\\?v\{d\}': 'ď', r'\\?v\{D\}': 'Ď',
-        r'\\?v\{e\}': 'ě', r'\\?v\{E\}': 'Ě',
-        r'\\?v\{l\}': 'ľ', r'\\?v\{L\}': 'Ľ',
-        r'\\?v\{n\}': 'ň', r'\\?v\{N\}': 'Ň',
-        r'\\?v\{r\}': 'ř', r'\\?v\{R\}': 'Ř',
-        r'\\?v\{s\}': 'š', r'\\?v\{S\}': 'Š',
-        r'\\?v\{t\}': 'ť', r'\\?v\{T\}': 'Ť',
-        r'\\?v\{z\}': 'ž', r'\\?v\{Z\}': 'Ž',
-        
-        # Acute: \'{x} - match both \' and just '
-        r"\\'a": 'á', r"\\'A": 'Á',
-        r"\\'e": 'é', r"\\'E": 'É',
-        r"\\'i": 'í', r"\\'I": 'Í',
-        r"\\'o": 'ó', r"\\'O": 'Ó',
-        r"\\'u": 'ú', r"\\'U": 'Ú',
-        r"\\'y": 'ý', r"\\'Y": 'Ý',
-        r"\\'c": 'ć', r"\\'C": 'Ć',
-        r"\\'n": 'ń', r"\\'N": 'Ń',
-        r"\\'s": 'ś', r"\\'S": 'Ś',
-        r"\\'z": 'ź', r"\\'Z": 'Ź',
-        
-        # Diaeresis: \"{x}
-        r'\\"a': 'ä', r'\\"A': 'Ä',
-        r'\\"e': 'ë', r'\\"E': 'Ë',
-        r'\\"i': 'ï', r'\\"I': 'Ï',
-        r'\\"o': 'ö', r'\\"O': 'Ö',
-        r'\\"u': 'ü', r'\\"U': 'Ü',
-        r'\\"y': 'ÿ',
-        
-        # Circumflex: \^{x}
-        r'\\?\^a': 'â', r'\\?\^A': 'Â',
-        r'\\?\^e': 'ê', r'\\?\^E': 'Ê',
-        r'\\?\^i': 'î', r'\\?\^I': 'Î',
-        r'\\?\^o': 'ô', r'\\?\^O': 'Ô',
-        r'\\?\^u': 'û', r'\\?\^U': 'Û',
-        
-        # Tilde: \~{x}
-        r'\\?~a': 'ã', r'\\?~A': 'Ã',
-        r'\\?~n': 'ñ', r'\\?~N': 'Ñ',
-        r'\\?~o': 'õ', r'\\?~O': 'Õ',
-        
-        # Cedilla: \c{x}
-        r'\\?c\{c\}': 'ç', r'\\?c\{C\}': 'Ç',
-        
-        # Breve: \u{x}
-        r'\\?u\{a\}': 'ă', r'\\?u\{A\}': 'Ă',
-        r'\\?u\{e\}': 'ĕ', r'\\?u\{E\}': 'Ĕ',
-        r'\\?u\{i\}': 'ĭ', r'\\?u\{I\}': 'Ĭ',
-        r'\\?u\{o\}': 'ŏ', r'\\?u\{O\}': 'Ŏ',
-        r'\\?u\{u\}': 'ŭ', r'\\?u\{U\}': 'Ŭ',
-        
-        # Double acute: \H{x}
-        r'\\?H\{o\}': 'ő', r'\\?H\{O\}': 'Ő',
-        r'\\?H\{u\}': 'ű', r'\\?H\{U\}': 'Ű',
-        
-        # Ogonek: \k{x}
-        r'\\?k\{a\}': 'ą', r'\\?k\{A\}': 'Ą',
-        r'\\?k\{e\}': 'ę', r'\\?k\{E\}': 'Ę',
-    }
-    
-    result = text
-    for latex_cmd, unicode_char in latex_accents.items():
-        result = re.sub(latex_cmd, unicode_char, result)
-    
-    return result
+    return _LATEX_RE.sub(lambda m: _LATEX_MAP[m.group(0)], text)
 
 
 def clean_text(text):
@@ -116,10 +132,98 @@ def clean_text(text):
     """
     if not text:
         return ""
-    # First convert LaTeX accents to Unicode
-    text = latex_to_unicode(text)
+    # First convert LaTeX accents to Unicode (skipped for plain text)
+    if _may_contain_accents(text):
+        text = latex_to_unicode(text)
     # Then normalize whitespace
-    return re.sub(r'\s+', ' ', text.strip().replace("\n", " "))
+    return _WS_RE.sub(' ', text).strip()
+
+
+# arXiv's fixed UTC timestamp layout, e.g. 2024-01-02T03:04:05Z
+_ISO_UTC_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z')
+
+# The RFC-2822 layout this project writes, e.g. "Tue, 02 Jan 2024 03:04:05 +0000"
+_RFC2822_RE = re.compile(r'\w{3}, \d{2} \w{3} \d{4} \d{2}:\d{2}:\d{2} [+-]\d{4}')
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+# timezone objects by "+HHMM" offset, reused across entries
+_TIMEZONES = {"+0000": timezone.utc}
+
+# (monotonic timestamp, datetime) of the last _now_utc() call
+_NOW_CACHE = [float("-inf"), None]
+# Fallback dates only need to be roughly current, so reuse "now" for this many seconds
+_NOW_CACHE_TTL = 60
+
+
+def _now_utc():
+    """Return the current UTC time, refreshed at most every _NOW_CACHE_TTL seconds."""
+    t = time.monotonic()
+    if t - _NOW_CACHE[0] > _NOW_CACHE_TTL:
+        _NOW_CACHE[:] = [t, datetime.now(timezone.utc)]
+    return _NOW_CACHE[1]
+
+
+def parse_iso_utc(date_str):
+    """
+    Parse a YYYY-MM-DDTHH:MM:SSZ timestamp by slicing out its fields.
+    
+    Much cheaper than strptime for this fixed layout.
+    
+    Args:
+        date_str (str): ISO 8601 UTC timestamp as returned by the arXiv API
+        
+    Returns:
+        datetime: Timezone-aware UTC datetime
+        
+    Raises:
+        ValueError: If date_str does not have the expected layout
+    """
+    if not _ISO_UTC_RE.fullmatch(date_str):
+        raise ValueError("expected YYYY-MM-DDTHH:MM:SSZ")
+    return datetime(
+        int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+        int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+        tzinfo=timezone.utc
+    )
+
+
+def parse_rfc2822(date_str):
+    """
+    Parse an RFC-2822 date, matching the common layout with a precompiled regex.
+    
+    Other forms (obsolete syntax, "-0000" offsets, ...) are left to
+    email.utils.parsedate_to_datetime, so results are the same as calling it.
+    
+    Args:
+        date_str (str): RFC-2822 date string
+        
+    Returns:
+        datetime: Parsed datetime
+        
+    Raises:
+        ValueError: If date_str cannot be parsed
+    """
+    if _RFC2822_RE.fullmatch(date_str):
+        # Fixed-width layout: slice out the fields
+        month = _MONTHS.get(date_str[8:11])
+        offset = date_str[26:]
+        # "-0000" means "no zone information" and parses to a naive datetime
+        if month is not None and offset != "-0000":
+            tz = _TIMEZONES.get(offset)
+            if tz is None:
+                minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+                tz = _TIMEZONES[offset] = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+            try:
+                return datetime(
+                    int(date_str[12:16]), month, int(date_str[5:7]),
+                    int(date_str[17:19]), int(date_str[20:22]), int(date_str[23:25]),
+                    tzinfo=tz
+                )
+            except ValueError:
+                pass
+    return parsedate_to_datetime(date_str)
 
 
 def format_date_for_rss(date_str):
@@ -138,22 +242,19 @@ def format_date_for_rss(date_str):
     try:
         # Handle ISO format (arXiv format)
         if 'T' in date_str and date_str.endswith('Z'):
-            dt = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            dt = dt.replace(tzinfo=timezone.utc)
-            return dt.strftime("%a, %d %b %Y %H:%M:%S %z")
+            return format_datetime(parse_iso_utc(date_str))
         
         # Handle RFC-2822 format (already correct)
         if date_str.count(',') == 1:
             # Try to parse as existing RFC-2822
             try:
-                dt = parsedate_to_datetime(date_str)
-                return dt.strftime("%a, %d %b %Y %H:%M:%S %z")
+                dt = parse_rfc2822(date_str)
+                return format_datetime(dt)
             except:
                 pass
         
         # Fallback to current time if can't parse
-        current_time = datetime.now(timezone.utc)
-        return current_time.strftime("%a, %d %b %Y %H:%M:%S %z")
+        return format_datetime(_now_utc())
         
     except Exception:
         # Return None for any parsing errors
@@ -170,8 +271,13 @@ def generate_entry_id(url):
     Returns:
         str: MD5 hash of the URL
     """
-    import hashlib
-    return hashlib.md5(url.encode()).hexdigest()
+    # IDs key the committed entries caches, so the hash must stay MD5;
+    # it is only an identifier, not a security measure
+    return hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+
+
+# Fields an entry needs before it is rendered instead of refetched
+_REQUIRED_FIELDS = ("title", "abstract", "authors", "pubdate")
 
 
 def is_entry_complete(entry):
@@ -184,5 +290,10 @@ def is_entry_complete(entry):
     Returns:
         bool: True if entry is complete, False otherwise
     """
-    required_fields = ["title", "abstract", "authors", "pubdate"]
-    return all(entry.get(field) and entry.get(field).strip() for field in required_fields)
+    get = entry.get
+    for field in _REQUIRED_FIELDS:
+        value = get(field)
+        # isspace() stops at the first non-space character and allocates nothing
+        if not value or value.isspace():
+            return False
+    return True